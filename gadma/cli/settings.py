@@ -66,6 +66,10 @@ const_for_mutation_rate = 1.02
 stuck_generation_number = 100
 eps = 1e-2
 
+# Exchange of models between runs that are launched in parallel
+exchange_models_every_n_generation = 10
+fraction_of_exchanged_models = 0.1
+
 # just for logging evaluations
 # output_log_file = None
 # max_num_of_eval = None # maximum number of logll eval.
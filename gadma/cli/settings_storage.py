@@ -93,7 +93,8 @@ class SettingsStorage(object):
                      'draw_models_every_n_iteration', 'size_of_generation',
                      'number_of_repeats', 'number_of_processes',
                      'number_of_populations', 'global_maxiter',
-                     'local_maxiter', 'num_init_const']
+                     'local_maxiter', 'num_init_const',
+                     'exchange_models_every_n_generation']
         float_attrs = ['theta0', 'time_for_generation', 'eps',
                        'const_of_time_in_drawing', 'vmin', 'min_n', 'max_n',
                        'min_t', 'max_t', 'min_m', 'max_m',
@@ -103,7 +104,8 @@ class SettingsStorage(object):
                        'const_for_mutation_rate', 'mutation_rate',
                        'time_to_print_summary']
         probs_attrs = ['mean_mutation_strength', 'mean_mutation_rate',
-                       'p_mutation', 'p_crossover', 'p_random']
+                       'p_mutation', 'p_crossover', 'p_random',
+                       'fraction_of_exchanged_models']
         bool_attrs = ['outgroup', 'linked_snp_s', 'only_sudden',
                       'no_migrations', 'silence', 'test', 'random_n_a',
                       'relative_parameters', 'only_models',
@@ -903,6 +905,8 @@ class SettingsStorage(object):
         ga.const_mut_strength = self.const_for_mutation_strength
         ga.eps = self.eps
         ga.n_stuck_gen = self.stuck_generation_number
+        ga.migration_interval = self.exchange_models_every_n_generation
+        ga.migration_rate = self.fraction_of_exchanged_models
         ga.maximize = True
 #        if self.random_n_a:
 #            ga.random_type = 'custom'
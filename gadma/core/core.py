@@ -1,5 +1,6 @@
 from ..cli import arg_parser
-from ..utils import StdAndFileLogger, bcolors
+from ..utils import StdAndFileLogger, StdToLoggerStream, LoggingQueue
+from ..utils import bcolors
 
 from .draw_and_generate_code import print_runs_summary
 from .core_run import CoreRun
@@ -8,22 +9,93 @@ from .shared_dict import SharedDictForCoreRun
 import os
 import sys
 
-from datetime import datetime
+import logging
+import logging.handlers
 import multiprocessing
-from multiprocessing import Pool
+from multiprocessing import Pool, Queue, Value
+from queue import Empty
+import signal
+import threading
 import time
 import traceback
+import numpy as np
 
 
 SUPPORT_STRING = "\nIn case of any questions or problems, "\
                  "please contact: ekaterina.e.noskova@gmail.com\n"
 
+# Shared dict, settings and queues for exchange of models of the process in
+# the pool, see :func:`init_worker`
+_shared_dict = None
+_settings = None
+_migration_queues = None
+# Maximum number of messages with models in one queue for exchange
+MIGRATION_QUEUE_SIZE = 10
+# Logger for output of the processes in the pool, see :func:`init_worker`
+OUTPUT_LOGGER_NAME = 'gadma.output'
 
-def job(index, shared_dict, settings):
+
+def init_worker(shared_dict, settings, migration_queues=None,
+                log_queue=None, worker_counter=None):
+    """
+    Initializer of processes in the pool. Shared dict keeps queue that could
+    not be pickled so it is passed to the process on its creation. Settings
+    (with data) are the same for all runs so they are also passed once per
+    process instead of once per run. Random generator is seeded once here
+    so processes do not share the state inherited from the main process.
+    Processes ignore keyboard interrupt, it is handled by the main process.
+    Output of the process is sent line by line to the log queue and is
+    written by the listener in the main process.
+
+    Processes of the pool form a ring for exchange of models: process
+    receives models from the previous process and sends its models to the
+    next one. Ring is formed by processes and not by runs as only runs in
+    different processes are run at the same time.
+
+    :param shared_dict: Shared dict between all runs.
+    :type shared_dict: :class:`gadma.core.shared_dict.SharedDictForCoreRun`
+    :param settings: Settings of the runs.
+    :type settings: :class:`gadma.cli.settings_storage.SettingsStorage`
+    :param migration_queues: Queues for exchange of models between runs,
+                             one for each process of the pool. If None then
+                             runs are independent.
+    :type migration_queues: list of :class:`multiprocessing.Queue`
+    :param log_queue: Queue for output of the process. If None then process
+                      writes its output itself.
+    :type log_queue: :class:`gadma.utils.utils.LoggingQueue`
+    :param worker_counter: Counter of started processes to give each process
+                           its place in the ring. Required if
+                           `migration_queues` is not None.
+    :type worker_counter: :class:`multiprocessing.Value`
+    """
+    global _shared_dict, _settings, _migration_queues
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if log_queue is not None:
+        logger = logging.getLogger(OUTPUT_LOGGER_NAME)
+        logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        sys.stdout = StdToLoggerStream(logger, logging.INFO)
+        sys.stderr = StdToLoggerStream(logger, logging.ERROR)
+    np.random.seed()
+    _shared_dict = shared_dict
+    _settings = settings
+    _migration_queues = None
+    if migration_queues is not None:
+        with worker_counter.get_lock():
+            worker_index = worker_counter.value
+            worker_counter.value += 1
+        n_queues = len(migration_queues)
+        _migration_queues = (migration_queues[(worker_index - 1) % n_queues],
+                             migration_queues[worker_index % n_queues])
+
+
+def job(index, shared_dict, settings, migration_queues=None):
     """
     Function of one parallel run of GADMA. Creates
     :class:`gadma.core.core_run.CoreRun` object and call its :meth:`run`
     method.
+    Returns index of the run and its final entry of the `shared_dict`.
 
     :param index: Index of the run.
     :type index: int
@@ -31,15 +103,79 @@ def job(index, shared_dict, settings):
     :type shared_dict: :class:`gadma.core.shared_dict.SharedDictForCoreRun`
     :param settings: Settings of the run.
     :type settings: :class:`gadma.cli.settings_storage.SettingsStorage`
+    :param migration_queues: Pair of queues (in_queue, out_queue) to
+                             exchange models with other runs.
+    :type migration_queues: tuple
     """
     try:
-        obj = CoreRun(index, shared_dict, settings)
+        obj = CoreRun(index, shared_dict, settings, migration_queues)
         obj.run(settings.get_optimizers_init_kwargs())
     except Exception as e:
         print(f"{bcolors.FAIL}Run {index} failed due to following exception:"
               f"{bcolors.ENDC}", file=sys.stderr)
         print(traceback.format_exc(), file=sys.stderr)
         raise e
+    return index, shared_dict.dict.get(index)
+
+
+def worker_job(index):
+    """
+    Runs :func:`job` in the process of the pool with its shared dict,
+    settings and queues for exchange of models.
+
+    :param index: Index of the run.
+    :type index: int
+    """
+    return job(index, _shared_dict, _settings, _migration_queues)
+
+
+def start_output_listener(log_queue, stdout, stderr):
+    """
+    Starts and returns listener that writes output of the processes in the
+    pool, see :func:`init_worker`. Errors are written to `stderr`, other
+    output is written to `stdout`.
+
+    :param log_queue: Queue for output of the processes.
+    :type log_queue: :class:`gadma.utils.utils.LoggingQueue`
+    :param stdout: Stream for output.
+    :param stderr: Stream for errors.
+    """
+    stdout_handler = logging.StreamHandler(stdout)
+    stdout_handler.addFilter(lambda record: record.levelno < logging.ERROR)
+    stderr_handler = logging.StreamHandler(stderr)
+    stderr_handler.setLevel(logging.ERROR)
+    listener = logging.handlers.QueueListener(log_queue, stdout_handler,
+                                              stderr_handler,
+                                              respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def join_pool(pool, shared_dict, migration_queues=None):
+    """
+    Waits for processes of the closed pool to finish. Processes send all
+    their data from queues before exit so queues are emptied meanwhile:
+    updates of the shared dict are received and models for exchange are
+    dropped.
+
+    :param pool: Closed pool of processes.
+    :type pool: :class:`multiprocessing.pool.Pool`
+    :param shared_dict: Shared dict between all runs.
+    :type shared_dict: :class:`gadma.core.shared_dict.SharedDictForCoreRun`
+    :param migration_queues: Queues for exchange of models between runs.
+    :type migration_queues: list of :class:`multiprocessing.Queue`
+    """
+    pool_join = threading.Thread(target=pool.join, daemon=True)
+    pool_join.start()
+    while pool_join.is_alive():
+        shared_dict.receive_updates()
+        for migration_queue in migration_queues or []:
+            try:
+                while True:
+                    migration_queue.get_nowait()
+            except Empty:
+                pass
+        pool_join.join(timeout=0.1)
 
 
 def main():
@@ -63,6 +199,13 @@ def main():
     sys.stdout = StdAndFileLogger(log_file, settings_storage.silence)
     sys.stderr = StdAndFileLogger(log_file, stderr=True)
 
+    # Output of the processes in the pool is written by one listener. It
+    # should be stopped while processes are alive as they could hold lock of
+    # the queue when they are terminated. Listener is set to None once it is
+    # stopped.
+    log_queue = LoggingQueue()
+    listener = start_output_listener(log_queue, sys.stdout, sys.stderr)
+
     try:
         # Data reading
         print("Data reading")
@@ -97,39 +240,56 @@ def main():
         print(f"{bcolors.OKBLUE}--Start pipeline--{bcolors.ENDC}")
 
         # Create shared dictionary
-        shared_dict = SharedDictForCoreRun()
+        shared_dict = SharedDictForCoreRun(
+            number_of_runs=settings_storage.number_of_repeats,
+            queue=Queue())
 
         # Start pool of processes
-        start_time = datetime.now()
+        start_time = time.monotonic()
 
         # For debug
     #    shared_dict = SharedDictForCoreRun(multiprocessing=False)
     #    job(0, shared_dict, settings_storage)
     #    os._exit(0)
 
-        pool = Pool(processes=settings_storage.number_of_processes)
+        # There is no need in more processes than runs
+        number_of_processes = min(settings_storage.number_of_processes,
+                                  settings_storage.number_of_repeats)
 
-        results = []
-        for proc_args in [(i + 1, shared_dict, settings_storage)
-                          for i in range(settings_storage.number_of_repeats)]:
-            results.append(pool.apply_async(job, proc_args))
+        # Create queues for exchange of models if runs are parallel, one
+        # queue for each process
+        migration_queues = None
+        if (number_of_processes > 1 and
+                settings_storage.exchange_models_every_n_generation > 0):
+            migration_queues = [Queue(maxsize=MIGRATION_QUEUE_SIZE)
+                                for _ in range(number_of_processes)]
 
+        pool = Pool(processes=number_of_processes,
+                    initializer=init_worker,
+                    initargs=(shared_dict, settings_storage,
+                              migration_queues, log_queue, Value('i', 0)))
+
+        # Results of runs are returned as soon as they are finished
+        results = pool.imap_unordered(
+            worker_job, range(1, settings_storage.number_of_repeats + 1))
         pool.close()
 
-        check_time = time.time()
+        final_entries = {}
+        check_time = time.monotonic()
         time_diff = 60 * settings_storage.time_to_print_summary
-        time_bias = 0
         get_time = min(5, time_diff)
-        while True:
-            time.sleep(get_time - time_bias)
-            time_bias = 0
-            all_finished = True
-            for r in results:
+        # Keyboard interrupt is handled for the whole waiting for the runs as
+        # it could happen while updates are received or summary is printed.
+        try:
+            while len(final_entries) < settings_storage.number_of_repeats:
                 try:
-                    r.get(0)
+                    index, process_dict = results.next(timeout=get_time)
+                    final_entries[index] = process_dict
                 except multiprocessing.TimeoutError:
-                    all_finished = False
+                    pass
                 except Exception:
+                    listener.stop()
+                    listener = None
                     pool.terminate()
                     print(f"{bcolors.FAIL}Main run failed due to following "
                           f"exception:{bcolors.ENDC}", file=sys.stderr)
@@ -138,15 +298,38 @@ def main():
                     sys.stdout = saved_stdout
                     sys.stderr = saved_stderr
                     os._exit(1)
-            if all_finished:
-                break
-            if (time.time() - check_time) >= time_diff:
-                check_time = time.time()
-                print_runs_summary(start_time, shared_dict, settings_storage)
-                time_bias = time.time() - check_time
-                time_bias %= get_time
-
-        pool.join()
+                shared_dict.receive_updates()
+                if (time.monotonic() - check_time) >= time_diff:
+                    check_time = time.monotonic()
+                    print_runs_summary(start_time, shared_dict,
+                                       settings_storage)
+
+            # All runs are finished and returned their final results.
+            # Processes could still wait for their old updates to be
+            # received.
+            join_pool(pool, shared_dict, migration_queues)
+            listener.stop()
+            listener = None
+        except KeyboardInterrupt:
+            # Processes could be killed while sending updates so we do not
+            # receive them anymore.
+            if listener is not None:
+                listener.stop()
+                listener = None
+            pool.terminate()
+            pool.join()
+            print(f"{bcolors.WARNING}--Pipeline was interrupted--"
+                  f"{bcolors.ENDC}")
+            print_runs_summary(start_time, shared_dict, settings_storage)
+            sys.exit(1)
+
+        # Final entries of the runs are returned by jobs, they should not be
+        # replaced by older updates from the queue.
+        shared_dict.receive_updates()
+        for index, process_dict in final_entries.items():
+            if process_dict is not None:
+                shared_dict.dict[index] = process_dict
+
         print_runs_summary(start_time, shared_dict, settings_storage)
 
         print('\n--Finish pipeline--\n')
@@ -161,6 +344,8 @@ def main():
         print('Thank you for using GADMA!')
         print(SUPPORT_STRING)
     finally:
+        if listener is not None:
+            listener.stop()
         sys.stdout = saved_stdout
         sys.stderr = saved_stderr
 
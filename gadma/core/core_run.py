@@ -33,12 +33,19 @@ class CoreRun(object):
     :param settings: Settings of the run. Information to form output directory
                      and so on will be taken from settings.
     :type settings: :class:`gadma.cli.settings_storage.SettingsStorage`
+    :param migration_queues: Pair of queues (in_queue, out_queue) to exchange
+                             models with other runs during global
+                             optimization. If None then run is independent.
+    :type migration_queues: tuple
     """
     REPORT_FILENAME = 'GADMA_GA.log'
     EVAL_FILENAME = 'eval_file'
     SAVE_FILENAME = 'save_file'
+    # Best model is sent to the main process not more often than once per
+    # this number of updates unless it is improved more than by eps.
+    SEND_EVERY_N_UPDATES = 10
 
-    def __init__(self, index, shared_dict, settings):
+    def __init__(self, index, shared_dict, settings, migration_queues=None):
         # 1. Save all init arguments
         self.index = index
         self.shared_dict = shared_dict
@@ -54,6 +61,8 @@ class CoreRun(object):
         # 2.2 Get optimizers and their kwargs that will be used.
         self.global_optimizer = self.settings.get_global_optimizer()
         self.local_optimizer = self.settings.get_local_optimizer()
+        if hasattr(self.global_optimizer, 'migration_queues'):
+            self.global_optimizer.migration_queues = migration_queues
         self.optimize_kwargs = self.settings.get_optimizers_kwargs()
         self.optimize_kwargs['callback'] = self.callback
 
@@ -110,6 +119,8 @@ class CoreRun(object):
 
         self.x_best = None
         self.y_best = None
+        self.y_sent = None
+        self.n_unsent_updates = 0
 
     @property
     def model(self):
@@ -145,7 +156,11 @@ class CoreRun(object):
         """
         Base callback:
 
-        1) Updates values of best solution in :attr:`shared_dict`.
+        1) Updates values of best solution in :attr:`shared_dict`. Solution\
+        is sent to the main process if it is better than the last sent one\
+        by `settings.eps` or if it was not sent during last\
+        :attr:`SEND_EVERY_N_UPDATES` updates. Its log-likelihood is always\
+        written to the shared memory.
         2) If new best values are received then draws and generates code to\
         the `output_dir` of this run.
 
@@ -173,8 +188,16 @@ class CoreRun(object):
         if self.x_best is None or sign * self.y_best > sign * y or not equal_x:
             self.x_best = x
             self.y_best = y
+            self.n_unsent_updates += 1
+            send = (self.y_sent is None or
+                    sign * (self.y_sent - y) >= self.settings.eps or
+                    self.n_unsent_updates >= self.SEND_EVERY_N_UPDATES)
+            if send:
+                self.y_sent = y
+                self.n_unsent_updates = 0
+            self.shared_dict.set_best_value(self.index, y)
             self.shared_dict._put_new_model_for_process(
-                self.index, best_by, (self.engine, x, y_dict))
+                self.index, best_by, (self.engine, x, y_dict), send=send)
             prefix = (self.settings.LOCAL_OUTPUT_DIR_PREFIX +
                       self.settings.LONG_NAME_2_SHORT.get(best_by, best_by))
             save_code_file = os.path.join(self.output_dir,
@@ -373,7 +396,6 @@ class CoreRun(object):
 
         :param initial_kwargs: Initial kwargs for optimization.
         """
-        np.random.seed()
         self.optimize_kwargs['callback'] = self.callback
         self.optimize_kwargs['save_file'] = self.get_save_file()
         # We set some kwargs if they were not set in run_with_increase
@@ -406,7 +428,6 @@ class CoreRun(object):
 
         :param initial_kwargs: Initial kwargs for optimization.
         """
-        np.random.seed()
         # Simple checks
         assert self.settings.initial_structure is not None
         assert self.settings.final_structure is not None
@@ -430,6 +451,9 @@ class CoreRun(object):
         for restore_file, structure, only_models, x_transform in options:
             X_init = result.X_out
             if self.model.get_structure() != structure:
+                # Model is changed inplace so models in shared dict that
+                # were saved without copy are copied first.
+                self.shared_dict.copy_models_for_process(self.index)
                 self.model, X_init = self.model.increase_structure(structure,
                                                                    X=X_init)
             Y_init = copy.copy(result.Y_out)
@@ -483,7 +507,7 @@ class CoreRun(object):
 
             if self.settings.initial_structure is not None:
                 restore_files, structures = sort_by_other_list(
-                    restore_files, structures, key=lambda x: sum(x))
+                    restore_files, structures, key=sum)
             else:
                 x_transform = (None, None)
                 if self.settings.generate_x_transform:
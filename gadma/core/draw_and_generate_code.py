@@ -7,8 +7,9 @@ from ..utils import bcolors
 import warnings
 import os
 import io
-from datetime import datetime
+import time
 import copy
+import numpy as np
 
 
 def draw_plots_to_file(x, engine, settings, filename, fig_title):
@@ -149,15 +150,17 @@ def print_runs_summary(start_time, shared_dict, settings):
     """
     Prints best demographic model by logLL among all processes.
 
-    :param start_time: Time when equation was started.
+    :param start_time: Time when equation was started, value of
+                       ``time.monotonic()``.
     :type start_time: float
     :param shared_dict: Dictionary to share information between processes.
     :type shared_dict: :class:`gadma.core.shared_dict.SharedDict`
     :param settings: Settings of run.
     :type settings: :class:`gadma.cli.settings_storage.SettingsStorage`
     """
-    s = (datetime.now() - start_time).total_seconds()
-    time_str = f"\n[{int(s//3600):03}:{int(s%3600//60):02}:{int(s%60):02}]"
+    minutes, seconds = divmod(int(time.monotonic() - start_time), 60)
+    hours, minutes = divmod(minutes, 60)
+    time_str = f"\n[{hours:03}:{minutes:02}:{seconds:02}]"
     print(time_str)
     metric_names = shared_dict.get_available_groups()
     if len(metric_names) == 0:
@@ -185,6 +188,15 @@ def print_runs_summary(start_time, shared_dict, settings):
             theta = engine.get_theta(x, *settings.get_engine_args())
             Nanc = engine.get_N_ancestral_from_theta(theta)
             addit_str = f"(theta = {theta: .2f})"
+            # Run could have better model that was not sent yet
+            current_value = shared_dict.get_best_value(index)
+            shown_value = y_vals.get('log-likelihood')
+            if isinstance(shown_value, tuple):
+                shown_value = shown_value[0]
+            if (best_by == 'log-likelihood' and current_value is not None and
+                    shown_value is not None and current_value > shown_value and
+                    not np.isclose(current_value, shown_value)):
+                addit_str += f" (current log-likelihood = {current_value:.2f})"
             if Nanc is not None or Nanc == 0:
                 if settings.relative_parameters:
                     addit_str += f" (Nanc = {int(Nanc)})"
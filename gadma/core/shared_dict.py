@@ -1,30 +1,92 @@
 from ..utils import WeightedMetaArray, is_pickleable
 from ..engines import Engine
 import copy
-from multiprocessing import Manager
+from multiprocessing import Array
+from queue import Empty
 from functools import partial
 from collections import OrderedDict
 import numpy as np
+import pickle
+import weakref
 
 
 class SharedDict(object):
     """
-    Wrapper class on ``multiprocessing.Manager.dict`` that could be used for
-    multiprocessing applications. Is used as shared memory of processes that
-    are run in parallel for GADMA.
+    Dictionary that could be used for multiprocessing applications. Is used
+    as shared memory of processes that are run in parallel for GADMA.
+
+    Each process keeps its own copy of the dictionary and changes only its
+    own entries. If `queue` is set then every time an entry is changed it is
+    sent to the main process via this queue. The main process should collect
+    those updates with :meth:`receive_updates`.
 
     All models in this dict can be divided in several processes and in several
     groups. When new model is added it has its own process and group. When
     dict should return some models it sort them by some value that is defined
     by `key` function and could be specific for each group.
 
-    :param multiprocessing: If False than usual dict will be used inside.
+    :param multiprocessing: If False than `queue` is not used and usual dict
+                            is used only.
+    :param queue: Queue to send changed entries to the main process. If None
+                  then entries are not sent.
+    :type queue: :class:`multiprocessing.Queue`
+
+    :note: Queue could not be pickled so the object should be passed to other
+           processes on their creation (e.g. with pool initializer).
+
+    :note: Queue should be emptied by the main process, otherwise processes
+           could not finish as they wait for their updates to be sent.
     """
-    def __init__(self, multiprocessing=True):
+    def __init__(self, multiprocessing=True, queue=None):
+        self.dict = dict()
+        self.queue = None
         if multiprocessing:
-            self.dict = Manager().dict()
-        else:
-            self.dict = dict()
+            self.queue = queue
+        # Groups of models that were saved without copy for each process,
+        # see :meth:`_put_new_model_for_process`
+        self._not_copied = dict()
+
+    def send_process_dict(self, process):
+        """
+        Sends entry of the process to the main process. Models of the entry
+        that were saved without copy are copied first as the entry is
+        pickled by the queue after this method returns.
+
+        :param process: Name of process.
+        """
+        if self.queue is not None:
+            self.copy_models_for_process(process)
+            self.queue.put((process, self.dict[process]))
+
+    def copy_models_for_process(self, process):
+        """
+        Copies models of the process that were saved without copy. Should be
+        called before these models are changed.
+
+        :param process: Name of process.
+        """
+        groups = self._not_copied.pop(process, set())
+        if len(groups) == 0 or process not in self.dict:
+            return
+        process_dict = OrderedDict(self.dict[process])
+        for group in groups:
+            if group in process_dict:
+                process_dict[group] = self._copy(process_dict[group])
+        self.dict[process] = process_dict
+
+    def receive_updates(self):
+        """
+        Receives all entries that were sent by processes and saves them in
+        the dict. Should be called in the main process.
+        """
+        if self.queue is None:
+            return
+        while True:
+            try:
+                process, process_dict = self.queue.get_nowait()
+            except Empty:
+                break
+            self.dict[process] = process_dict
 
     def default_key(self, group):
         """
@@ -47,7 +109,17 @@ class SharedDict(object):
             return model
         return key(model)
 
-    def _put_new_model_for_process(self, process, group, model, key=None):
+    @staticmethod
+    def _copy(obj):
+        """
+        Returns deep copy of the object. Pickle is used as it is much faster
+        than ``copy.deepcopy`` for engines and models.
+        """
+        return pickle.loads(pickle.dumps(obj,
+                                         protocol=pickle.HIGHEST_PROTOCOL))
+
+    def _put_new_model_for_process(self, process, group, model, key=None,
+                                   send=True):
         if key is None:
             key = self.default_key(group)
         copy_dict = dict(self.dict)
@@ -55,8 +127,17 @@ class SharedDict(object):
             process_dict = OrderedDict(copy_dict[process])
         except KeyError:
             process_dict = OrderedDict()
-        process_dict[group] = copy.deepcopy(model)
+        # Model is copied only when it is sent, otherwise it is kept as it is
+        # and is copied later, see :meth:`copy_models_for_process`.
+        if send:
+            process_dict[group] = self._copy(model)
+            self._not_copied.get(process, set()).discard(group)
+        else:
+            process_dict[group] = model
+            self._not_copied.setdefault(process, set()).add(group)
         self.dict[process] = process_dict
+        if send:
+            self.send_process_dict(process)
 
     def update_best_model_for_process(self, process, group, model, key=None):
         """
@@ -112,8 +193,10 @@ class SharedDict(object):
         else:
             models = []
         models.append(model)
-        process_dict[group] = copy.deepcopy(models)
+        process_dict[group] = self._copy(models)
+        self._not_copied.get(process, set()).discard(group)
         self.dict[process] = process_dict
+        self.send_process_dict(process)
 
     def get_models_for_process_in_group(self, process, group, key=None):
         """
@@ -143,11 +226,13 @@ class SharedDict(object):
             process_models = self.get_models_for_process_in_group(process,
                                                                   group,
                                                                   key=key)
-            if len(process_models) > 0:
-                for model in process_models:
-                    models.append([process, model])
-            models = sorted(models, key=lambda x: key(x[1]), reverse=True)
-        return models
+            for model in process_models:
+                models.append([process, model])
+        # Sort once, value of key is computed only one time for each model
+        values = [self.get_value(model, key) for _, model in models]
+        order = sorted(range(len(models)), key=values.__getitem__,
+                       reverse=True)
+        return [models[i] for i in order]
 
     def get_best_model_in_group(self, group, key=None):
         """
@@ -191,7 +276,58 @@ class SharedDictForCoreRun(SharedDict):
     Process is name of the process or index of CoreRun. Group is name of
     fitness function: log-likelihood, AIC, CLAIC. Model is tuple of
     demographic model, engine and fitness for this engine.
+
+    Current best log-likelihoods of runs are also kept in shared memory so
+    they could be read by the main process without any pickling even if the
+    corresponding models were not sent yet.
+
+    :param multiprocessing: If False than `queue` is not used, usual dict is
+                            used only and best values are not kept in
+                            shared memory.
+    :param number_of_runs: Number of runs, runs should have indices from 1 to
+                           `number_of_runs`. If 0 then best values are not
+                           kept in shared memory.
+    :param queue: Queue to send changed entries to the main process. If None
+                  then entries are not sent.
+    :type queue: :class:`multiprocessing.Queue`
     """
+    def __init__(self, multiprocessing=True, number_of_runs=0, queue=None):
+        super(SharedDictForCoreRun, self).__init__(multiprocessing, queue)
+        # Results of pickleability checks of models, see construct_model.
+        # Models are not kept alive by this dict.
+        self._pickleable_models = weakref.WeakKeyDictionary()
+        self.best_values = None
+        if multiprocessing and number_of_runs > 0:
+            # Each value is written only by its own run so lock is not needed
+            self.best_values = Array('d', [np.nan] * number_of_runs,
+                                     lock=False)
+
+    def set_best_value(self, process, value):
+        """
+        Sets current best log-likelihood of the run in shared memory.
+
+        :param process: Index of the run.
+        :param value: Value of log-likelihood.
+        """
+        if (self.best_values is not None and
+                1 <= process <= len(self.best_values)):
+            self.best_values[process - 1] = value
+
+    def get_best_value(self, process):
+        """
+        Returns current best log-likelihood of the run from shared memory or
+        None if it is not available.
+
+        :param process: Index of the run.
+        """
+        if (self.best_values is None or
+                not 1 <= process <= len(self.best_values)):
+            return None
+        value = self.best_values[process - 1]
+        if np.isnan(value):
+            return None
+        return value
+
     def default_key(self, group):
         """
         For not `log-likelihood` groups sort should be reversed so `key`
@@ -219,7 +355,8 @@ class SharedDictForCoreRun(SharedDict):
         """
         if not isinstance(y, dict):
             y = OrderedDict({group: y})
-        if isinstance(engine, Engine) and not is_pickleable(engine.model):
+        if (isinstance(engine, Engine) and
+                not self._is_pickleable(engine.model)):
             engine = copy.deepcopy(engine)
             super(Engine, engine).__setattr__("_model", None)
         # print(type(x), x)
@@ -227,6 +364,23 @@ class SharedDictForCoreRun(SharedDict):
             return (engine, (x, x.metadata), y)
         return (engine, x, y)
 
+    def _is_pickleable(self, model):
+        """
+        Checks if demographic model could be pickled. Check requires full
+        dump of the model so its result is saved for each model object.
+        Result is assumed to be the same when model is changed inplace (e.g.
+        its structure is increased).
+        """
+        try:
+            return self._pickleable_models[model]
+        except KeyError:
+            result = is_pickleable(model)
+            self._pickleable_models[model] = result
+            return result
+        except TypeError:
+            # Objects that could not be weakly referenced are not saved
+            return is_pickleable(model)
+
     def _extract_model(self, model):
         """
         Extract engine, x, y from the model in shared dict. Reverse function
@@ -247,7 +401,10 @@ class SharedDictForCoreRun(SharedDict):
         sign = -1
         if group == 'log-likelihood':
             sign = 1
-        _1, _2, y = self.construct_model(group, *model)
+        # Model is not constructed here as it could require copy of engine
+        y = model[2]
+        if not isinstance(y, dict):
+            y = {group: y}
         if isinstance(y[group], tuple):
             ff = y[group][0]
         else:
@@ -256,12 +413,13 @@ class SharedDictForCoreRun(SharedDict):
             return sign * np.inf
         return sign * ff
 
-    def _put_new_model_for_process(self, process, group, model, key=None):
+    def _put_new_model_for_process(self, process, group, model, key=None,
+                                   send=True):
         if isinstance(model, tuple):
             engine, x, y = model
         model = self.construct_model(group, engine, x, y)
         r = super(SharedDictForCoreRun, self)._put_new_model_for_process(
-            process, group, model)
+            process, group, model, send=send)
         return r
 
     def update_best_model_for_process(self, process, group, engine, x, y):
@@ -1,15 +1,17 @@
 from .optimizer import ConstrainedOptimizer
 from .global_optimizer import GlobalOptimizer, register_global_optimizer
 from .optimizer_result import OptimizerResult
-from ..utils import sort_by_other_list, choose_by_weight, eval_wrapper
+from ..utils import choose_by_weight, eval_wrapper
 from ..utils import trunc_normal_3_sigma_rule, DiscreteVariable,\
                     WeightedMetaArray
 from ..utils import update_by_one_fifth_rule, ensure_file_existence, fix_args
 from ..utils import list_with_weights_for_pickle,\
                     list_with_weights_after_pickle
 from functools import partial
+from queue import Empty, Full
 import numpy as np
 import copy
+import io
 import sys
 import time
 
@@ -85,6 +87,16 @@ class GeneticAlgorithm(GlobalOptimizer, ConstrainedOptimizer):
                             Provide generator from variables:
                             custom_rand_gen(variables) = values
     :type custom_rand_gen: func
+    :param migration_interval: Number of generations between migrations of
+                               solutions from/to other genetic algorithms
+                               that are run in parallel (island model). If
+                               0 then there is no migration. Migration is
+                               performed only if :attr:`migration_queues`
+                               are set.
+    :type migration_interval: int
+    :param migration_rate: Fraction of generation that is sent to another
+                           genetic algorithm during migration.
+    :type migration_rate: float
     :param log_transform: If True then logarithm will be used incide for
                           parameters.
     :type log_transform: bool
@@ -100,6 +112,7 @@ class GeneticAlgorithm(GlobalOptimizer, ConstrainedOptimizer):
                  mutation_type='gaussian', one_fifth_rule=True,
                  crossover_type='uniform', crossover_k=None,
                  random_type='resample', custom_rand_gen=None,
+                 migration_interval=0, migration_rate=0.1,
                  log_transform=False, maximize=False):
         # Simple checks
         assert isinstance(gen_size, int)
@@ -112,6 +125,8 @@ class GeneticAlgorithm(GlobalOptimizer, ConstrainedOptimizer):
         assert (mut_strength >= 0 and mut_strength <= 1)
         assert (const_mut_rate >= 1 and const_mut_rate <= 2)
         assert (const_mut_strength >= 1 and const_mut_strength <= 2)
+        assert isinstance(migration_interval, int) and migration_interval >= 0
+        assert (migration_rate >= 0 and migration_rate <= 1)
 
         self.gen_size = gen_size
         self.n_elitism = n_elitism
@@ -141,6 +156,10 @@ class GeneticAlgorithm(GlobalOptimizer, ConstrainedOptimizer):
                              "(custom_rand_gen) for 'custom' type of random "
                              "sampling.")
         self.one_fifth_rule = one_fifth_rule
+        self.migration_interval = migration_interval
+        self.migration_rate = migration_rate
+        # Pair of queues (in_queue, out_queue) to receive and send migrants
+        self.migration_queues = None
         super(GeneticAlgorithm, self).__init__(log_transform, maximize)
 
     def randomize(self, variables, random_type='resample',
@@ -202,7 +221,7 @@ class GeneticAlgorithm(GlobalOptimizer, ConstrainedOptimizer):
         # Check x and change weights if they exist
         x_mut = self.check_x(variables, x_mut)
         if isinstance(x, WeightedMetaArray):
-            x_mut.weights = copy.deepcopy(x.weights)
+            x_mut.weights = np.array(x.weights)
             x_mut.metadata = x.metadata
         else:
             x_mut.weights = np.ones(len(x))
@@ -373,7 +392,7 @@ class GeneticAlgorithm(GlobalOptimizer, ConstrainedOptimizer):
         if Y_gen is None:
             Y_gen = [f(x) for x in X_gen]
         # Sort by value of fitness
-        X_gen, Y_gen = sort_by_other_list(X_gen, Y_gen, reverse=False)
+        X_gen, Y_gen = self._sort_by_fitness(X_gen, Y_gen)
 
         # Simple checks
         assert len(X_gen[0]) == len(variables)
@@ -414,34 +433,19 @@ class GeneticAlgorithm(GlobalOptimizer, ConstrainedOptimizer):
         new_X_gen = list(X_gen[:self.n_elitism])
         new_Y_gen = list(Y_gen[:self.n_elitism])
 
+        # All offsprings are created first and then evaluated together
         # 2. Mutation
-        for i in range(n_mutants):
-            x_ind = np.random.choice(range(len(X_gen)), p=p)
-            x = X_gen[x_ind]
-            mutants = self.mutation(x, variables, self.mutation_type,
-                                    self.one_fifth_rule, self.mut_attempts)
-            fitness = [f(x_mut) for x_mut in mutants]
-
-#            print("Time of main part of mutation: " + str(t3 - t1))
-            # Take best mutant
-            new_Y_gen.append(np.min(fitness))
-            new_X_gen.append(mutants[fitness.index(new_Y_gen[-1])])
-
-            # One more check for weights.
-            # If new x is better, then we would like to decrease weights of
-            # parameters back as this change was good.
-            if new_Y_gen[-1] < Y_gen[x_ind]:
-                if isinstance(x, WeightedMetaArray):
-                    new_X_gen[-1].weights = x.weights
+        mut_inds = np.random.choice(len(X_gen), size=n_mutants, p=p)
+        all_mutants = [self.mutation(X_gen[x_ind], variables,
+                                     self.mutation_type, self.one_fifth_rule,
+                                     self.mut_attempts)
+                       for x_ind in mut_inds]
 
         # 3. Crossover
-        for i in range(n_offsprings):
-            ind1, ind2 = np.random.choice(range(len(X_gen)), size=2, p=p)
-            parent1, parent2 = X_gen[ind1], X_gen[ind2]
-            x = self.crossover(parent1, parent2, variables,
-                               self.crossover_type, self.crossover_k)
-            new_X_gen.append(x)
-            new_Y_gen.append(f(x))
+        cross_inds = np.random.choice(len(X_gen), size=(n_offsprings, 2), p=p)
+        X_other = [self.crossover(X_gen[ind1], X_gen[ind2], variables,
+                                  self.crossover_type, self.crossover_k)
+                   for ind1, ind2 in cross_inds]
 
         # 4. Random individuals
         for i in range(n_random_gen):
@@ -449,15 +453,121 @@ class GeneticAlgorithm(GlobalOptimizer, ConstrainedOptimizer):
                                                  self.custom_rand_gen),
                                   dtype=object)
             x.metadata = 'r'
-            new_X_gen.append(x)
-            new_Y_gen.append(f(x))
+            X_other.append(x)
+
+        X_eval = [x_mut for mutants in all_mutants for x_mut in mutants]
+        X_eval.extend(X_other)
+        Y_eval = self.evaluate_population(f, X_eval)
+
+        # Take best mutant for each mutated solution
+        i_eval = 0
+        for x_ind, mutants in zip(mut_inds, all_mutants):
+            fitness = Y_eval[i_eval:i_eval + len(mutants)]
+            i_eval += len(mutants)
+            i_best = int(np.argmin(fitness))
+            new_X_gen.append(mutants[i_best])
+            new_Y_gen.append(fitness[i_best])
+
+            # One more check for weights.
+            # If new x is better, then we would like to decrease weights of
+            # parameters back as this change was good.
+            x = X_gen[x_ind]
+            if new_Y_gen[-1] < Y_gen[x_ind]:
+                if isinstance(x, WeightedMetaArray):
+                    new_X_gen[-1].weights = x.weights
+        new_X_gen.extend(X_other)
+        new_Y_gen.extend(Y_eval[i_eval:])
 
         # Sort by fitness and return new generation
-        new_X_gen, new_Y_gen = sort_by_other_list(new_X_gen, new_Y_gen,
-                                                  reverse=False)
-        new_X_gen = new_X_gen[:self.gen_size]
-        new_Y_gen = new_Y_gen[:self.gen_size]
-        return new_X_gen, new_Y_gen
+        return self._sort_by_fitness(new_X_gen, new_Y_gen, self.gen_size)
+
+    @staticmethod
+    def _sort_by_fitness(X, Y, size=None):
+        """
+        Sorts solutions `X` by their fitnesses `Y` in increasing order and
+        returns first `size` of them. Fitnesses are sorted as numpy array
+        (with stable sort), solutions are only reordered.
+
+        :param X: Solutions.
+        :param Y: Fitnesses of solutions.
+        :param size: Number of the best solutions to return. If None then all
+                     solutions are returned.
+        """
+        order = np.argsort(np.asarray(Y, dtype=float), kind='stable')
+        if size is not None:
+            order = order[:size]
+        return [X[i] for i in order], [Y[i] for i in order]
+
+    @staticmethod
+    def _migration_key(variables):
+        """
+        Returns key of the search space defined by `variables`. Migrants are
+        accepted only from genetic algorithms with the same key.
+        """
+        return tuple((var.name, var.__class__.__name__) for var in variables)
+
+    def migration(self, variables, X_gen, Y_gen):
+        """
+        Performs migration of solutions between genetic algorithms that are
+        run in parallel. Best solutions of the generation are sent to the
+        out queue and solutions from the in queue replace random solutions of
+        generation except elite ones. Queues are never waited for.
+
+        :param variables: Variables of the optimization.
+        :param X_gen: Current generation sorted by fitness.
+        :param Y_gen: Fitnesses of the current generation.
+
+        :returns: New generation and its fitnesses.
+        """
+        in_queue, out_queue = self.migration_queues
+        key = self._migration_key(variables)
+        n_migrants = max(int(self.migration_rate * len(X_gen)), 1)
+
+        try:
+            out_queue.put_nowait((key,
+                                  list_with_weights_for_pickle(
+                                      X_gen[:n_migrants]),
+                                  list(Y_gen[:n_migrants])))
+        except Full:
+            pass
+
+        X_migr, Y_migr = [], []
+        while True:
+            try:
+                migr_key, X, Y = in_queue.get_nowait()
+            except Empty:
+                break
+            if migr_key == key:
+                X_migr.extend(list_with_weights_after_pickle(X))
+                Y_migr.extend(Y)
+        if len(X_migr) == 0:
+            return X_gen, Y_gen
+
+        X_migr, Y_migr = self._sort_by_fitness(X_migr, Y_migr)
+        n_replaced = min(n_migrants, len(X_migr),
+                         len(X_gen) - self.n_elitism)
+        if n_replaced <= 0:
+            return X_gen, Y_gen
+        X_gen, Y_gen = list(X_gen), list(Y_gen)
+        indices = np.random.choice(range(self.n_elitism, len(X_gen)),
+                                   size=n_replaced, replace=False)
+        for ind, x, y in zip(indices, X_migr, Y_migr):
+            X_gen[ind] = x
+            Y_gen[ind] = y
+        return self._sort_by_fitness(X_gen, Y_gen)
+
+    def evaluate_population(self, f, X):
+        """
+        Evaluates function `f` on all solutions `X` of the generation. All
+        new solutions of the generation are evaluated by this method so it
+        is the only place to change for parallel evaluation.
+
+        :param f: Function to evaluate.
+        :param X: Solutions.
+
+        :returns: list of values of `f`.
+        """
+        return [f(x) for x in X]
 
     def _sample_mut_rate(self, mode='normal'):
         if mode == 'normal':
@@ -540,23 +650,16 @@ class GeneticAlgorithm(GlobalOptimizer, ConstrainedOptimizer):
                `Y_gen` and `y_best` must be already multiplied by -1 if we\
                have maximization instead of minimization.
         """
-        if report_file is not None:
-            stream = open(report_file, 'a')
-        else:
-            stream = sys.stdout
+        # Report is collected in memory and written at once so the report
+        # file is opened only one time per generation.
+        stream = io.StringIO()
         print(f"Generation #{n_gen}.", file=stream)
         print("Current generation of solutions:", file=stream)
         print("N", "Value of fitness function", "Solution",
               file=stream, sep='\t')
-        if report_file is not None:
-            stream.close()
         for i, (x, y) in enumerate(zip(X_gen, Y_gen)):
-            # Use parent's report write function
-            super(GeneticAlgorithm, self).write_report(i, variables, x,
-                                                       f'{y: 5f}',
-                                                       report_file)
-        if report_file is not None:
-            stream = open(report_file, 'a')
+            # Use parent's report line
+            print(self.report_line(i, variables, x, f'{y: 5f}'), file=stream)
 
         if self.one_fifth_rule:
             print(f"Current mean mutation rate:\t{self.cur_mut_rate: 3f}",
@@ -568,19 +671,17 @@ class GeneticAlgorithm(GlobalOptimizer, ConstrainedOptimizer):
         print("\n--Best solution by value of fitness function--", file=stream)
         print("Value of fitness:", y_best, file=stream)
         print("Solution:", file=stream, end='')
-        if report_file is not None:
-            stream.close()
-        super(GeneticAlgorithm, self).write_report('', variables, x_best,
-                                                   '', report_file)
-        if report_file is not None:
-            stream = open(report_file, 'a')
+        print(self.report_line('', variables, x_best, ''), file=stream)
 
         if mean_time is not None:
             print(f"\nMean time:\t{mean_time:.3f} sec.\n", file=stream)
         print("\n", file=stream)
 
         if report_file is not None:
-            stream.close()
+            with open(report_file, 'a') as fl:
+                fl.write(stream.getvalue())
+        else:
+            sys.stdout.write(stream.getvalue())
 
     def save(self, n_gen, n_eval, n_impr_gen, X_gen, Y_gen, X_total, Y_total,
              save_file):
@@ -771,9 +872,7 @@ class GeneticAlgorithm(GlobalOptimizer, ConstrainedOptimizer):
         X_gen, Y_gen = self.initial_design(f_in_opt, variables, num_init,
                                            X_init, Y_init, self.random_type,
                                            self.custom_rand_gen)
-        X_gen, Y_gen = sort_by_other_list(X_gen, Y_gen, reverse=False)
-        X_gen = X_gen[:self.gen_size]
-        Y_gen = Y_gen[:self.gen_size]
+        X_gen, Y_gen = self._sort_by_fitness(X_gen, Y_gen, self.gen_size)
 
         # transform for save function and result
         # X_gen and Y_gen are in translated form and X_gen_cor, Y_gen_cor not
@@ -781,9 +880,10 @@ class GeneticAlgorithm(GlobalOptimizer, ConstrainedOptimizer):
         X_gen_cor = [self.inv_transform(x) for x in X_gen]
         Y_gen_cor = [self.sign * y for y in Y_gen]
 
-        # Save total
-        X_total.extend(copy.deepcopy(X_gen_cor))
-        Y_total.extend(copy.deepcopy(Y_gen_cor))
+        # Save total. Solutions are never changed inplace so we keep them
+        # without copies.
+        X_total.extend(X_gen_cor)
+        Y_total.extend(Y_gen_cor)
 
         # Initialize number of generations, evaluations, best values and so on
         # x_best and y_best will be in good units!!
@@ -808,18 +908,23 @@ class GeneticAlgorithm(GlobalOptimizer, ConstrainedOptimizer):
                 not self.is_stopped(n_gen, n_eval, n_impr_gen,
                                     maxiter, maxeval)):
             # record time of generation start
-            start_time = time.time()
+            start_time = time.monotonic()
             # Form new generation
             X_gen, Y_gen = self.selection(f_in_opt, variables, X_gen, Y_gen,
                                           self.selection_type,
                                           self.selection_random)
+            # Exchange solutions with other genetic algorithms
+            if (self.migration_queues is not None and
+                    self.migration_interval > 0 and
+                    (n_gen + 1) % self.migration_interval == 0):
+                X_gen, Y_gen = self.migration(variables, X_gen, Y_gen)
 
             X_gen_cor = [self.inv_transform(x) for x in X_gen]
             Y_gen_cor = [self.sign * y for y in Y_gen]
 
             # Save all generations.
-            X_total.extend(copy.deepcopy(X_gen_cor))
-            Y_total.extend(copy.deepcopy(Y_gen_cor))
+            X_total.extend(X_gen_cor)
+            Y_total.extend(Y_gen_cor)
 
             # Check if we improve the result
             if self.sign * (y_best - Y_gen_cor[0]) >= self.eps:
@@ -845,7 +950,7 @@ class GeneticAlgorithm(GlobalOptimizer, ConstrainedOptimizer):
             # Update numbers
             n_gen += 1
             n_eval = n_eval_init + prepared_f.cache_info.misses
-            times.append(time.time() - start_time)
+            times.append(time.monotonic() - start_time)
 
             # Callback
             if callback is not None:
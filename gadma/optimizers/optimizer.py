@@ -11,6 +11,9 @@ from ..utils import ensure_file_existence, check_file_existence,\
 from ..utils import logarithm_transform, exponent_transform, ident_transform
 import pickle
 
+# Size of the buffer for files with saved information of optimizers
+SAVE_FILE_BUFFER_SIZE = 1024 * 1024
+
 
 class Optimizer(object):
     """
@@ -88,13 +91,24 @@ class Optimizer(object):
             stream = open(report_file, 'a')
         else:
             stream = sys.stdout
+        print(self.report_line(n_iter, variables, x, y), file=stream)
+        if report_file:
+            stream.close()
+
+    def report_line(self, n_iter, variables, x, y):
+        """
+        Returns line of report for :meth:`write_report` method.
+
+        :param n_iter: Number of iteration of optimization.
+        :param variables: list of variables which values are optimized.
+        :param x: Values of variables.
+        :param y: Value of target function on `x`.
+        """
         x_repr = variables_values_repr(variables, x)
         metainfo = ''
         if hasattr(x, 'metadata'):
             metainfo = x.metadata
-        print(n_iter, y, x_repr, metainfo, sep='\t', file=stream)
-        if report_file:
-            stream.close()
+        return '\t'.join([str(n_iter), str(y), x_repr, str(metainfo)])
 
     def wrap_for_report(self, f, variables, verbose, report_file):
         """
@@ -181,14 +195,16 @@ class Optimizer(object):
         :param save_file: File to save information.
 
         :note: if save_file is None then nothing will be done. In base class\
-               method just dumps `info` to `save_file` with `pickle`.
+               method just dumps `info` to `save_file` with `pickle`\
+               using the highest protocol.
         """
         if save_file is None:
             return
         if hasattr(self, 'id'):
             if (check_file_existence(save_file) and
                     os.path.getsize(save_file) > 0):
-                with open(save_file, 'rb') as fl:
+                with open(save_file, 'rb',
+                          buffering=SAVE_FILE_BUFFER_SIZE) as fl:
                     d = pickle.load(fl)
                 if not isinstance(d, dict):
                     d = {}
@@ -196,8 +212,8 @@ class Optimizer(object):
                 d = {}
             d[self.id] = copy.copy(info)
             info = d
-        with open(save_file, 'wb') as fl:
-            pickle.dump(info, fl)
+        with open(save_file, 'wb', buffering=SAVE_FILE_BUFFER_SIZE) as fl:
+            pickle.dump(info, fl, protocol=pickle.HIGHEST_PROTOCOL)
 
     def valid_restore_file(self, save_file):
         """
@@ -216,7 +232,7 @@ class Optimizer(object):
 
         :note: In base class method just loads from `save_file` with pickle.
         """
-        with open(save_file, 'rb') as fl:
+        with open(save_file, 'rb', buffering=SAVE_FILE_BUFFER_SIZE) as fl:
             info = pickle.load(fl)
         if hasattr(self, 'id') and isinstance(info, dict):
             return info[self.id]
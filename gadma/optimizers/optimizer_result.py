@@ -39,13 +39,39 @@ class OptimizerResult(object):
         self.success = success
         self.status = status
         self.message = message
-        self.X = copy.deepcopy(X)
+        self.X = self._copy_solutions(X)
         self.Y = Y
         self.n_eval = n_eval
         self.n_iter = n_iter
-        self.X_out = copy.deepcopy(X_out)
+        self.X_out = self._copy_solutions(X_out)
         self.Y_out = Y_out
 
+    @staticmethod
+    def _copy_solution(x):
+        """
+        Returns copy of the solution. Arrays are copied with
+        ``numpy.ndarray.copy`` that keeps their class and is much faster than
+        ``copy.deepcopy``. Their metadata and weights are shared with the
+        original array after that so they are copied separately.
+        """
+        if not isinstance(x, np.ndarray):
+            return copy.deepcopy(x)
+        x_copy = x.copy()
+        if hasattr(x, 'metadata'):
+            x_copy.metadata = copy.deepcopy(x.metadata)
+        if hasattr(x, 'weights'):
+            x_copy.weights = copy.deepcopy(x.weights)
+        return x_copy
+
+    @staticmethod
+    def _copy_solutions(X):
+        """
+        Returns copy of the list of solutions, see :meth:`_copy_solution`.
+        """
+        if isinstance(X, list):
+            return [OptimizerResult._copy_solution(x) for x in X]
+        return OptimizerResult._copy_solution(X)
+
     @staticmethod
     def from_SciPy_OptimizeResult(
             scipy_result: optimize.OptimizeResult):
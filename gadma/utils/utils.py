@@ -1,11 +1,12 @@
 from functools import wraps
+import logging
+import weakref
 import time
 import numpy as np
 import sys
 import os
-import tempfile
 import pickle
-from multiprocessing import Process, Queue, queues
+from multiprocessing import Process, Queue, queues, get_context
 
 
 def logarithm_transform(x):
@@ -59,12 +60,15 @@ def sort_by_other_list(x, y, reverse=False, key=None):
     """
     Sort ``x`` and ``y`` according to values in ``y``.
     """
-    def ident(x):
-        return x
+    x, y = list(x), list(y)
+    n = min(len(x), len(y))
+    # Value of key is computed only one time for each element
     if key is None:
-        key = ident
-    sort_zip = sorted(zip(x, y), key=lambda p: key(p[1]), reverse=reverse)
-    return [p[0] for p in sort_zip], [p[1] for p in sort_zip]
+        values = y
+    else:
+        values = [key(y_i) for y_i in y[:n]]
+    order = sorted(range(n), key=values.__getitem__, reverse=reverse)
+    return [x[i] for i in order], [y[i] for i in order]
 
 
 def fix_args(f, *args):
@@ -179,17 +183,29 @@ def cache_func(f):
 #     return nan_fval_to_inf_wrapper
 
 
+def open_for_append(filename):
+    """
+    Opens file for appending and returns its file descriptor. Writes with
+    ``os.write`` to this descriptor are not buffered and are appended to the
+    end of file even if the file is written by several processes.
+
+    :param filename: File to open.
+    """
+    return os.open(filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+
 def eval_wrapper(f, eval_file=None):
     r"""
     Returns good function for optimization. Each evaluation of function will
-    be written in file. If needed function will be cached.
+    be written in file. If needed function will be cached. File is opened
+    only once and is closed when returned function is deleted.
 
     :param f: function. Is called as f(x, \*args).
     :param args: tuple of arguments.
     :param eval_file: file to write evaluations.
     :param cache: if True then function will be cached.
     """
-    time_init = time.time()
+    time_init = time.monotonic()
     first_line = '\t'.join(['Time of evaluation start', 'Function value',
                             'Parameters values', 'Evaluation time'])
     if eval_file is not None:
@@ -202,16 +218,22 @@ def eval_wrapper(f, eval_file=None):
             with open(eval_file, 'a') as fl:
                 print(first_line, file=fl, sep='\t')
 
+    fd = None
+    if eval_file is not None:
+        fd = open_for_append(eval_file)
+
     @wraps(f)
     def eval_wrapper_f(x):
-        time_start = time.time()
+        time_start = time.monotonic()
         y = f(x)
-        time_end = time.time()
-        if eval_file is not None:
-            with open(eval_file, 'a') as fl:
-                print(time_start - time_init, y, list(x),
-                      time_end - time_start, file=fl, sep='\t')
+        time_end = time.monotonic()
+        if fd is not None:
+            line = '\t'.join([str(time_start - time_init), str(y),
+                              str(list(x)), str(time_end - time_start)])
+            os.write(fd, (line + '\n').encode())
         return y
+    if fd is not None:
+        weakref.finalize(eval_wrapper_f, os.close, fd)
     return eval_wrapper_f
 
 
@@ -379,16 +401,11 @@ def is_pickleable(obj):
     """
     Returns True if obj could be dumped with pickle.
     """
-    fd, path = tempfile.mkstemp()
     try:
-        with os.fdopen(fd, 'wb') as tmp:
-            pickler = pickle.Pickler(tmp)
-            pickler.dump(obj)
+        pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
         return True
     except pickle.PicklingError:
         return False
-    finally:
-        os.remove(path)
 
 
 class StdAndFileLogger(object):
@@ -401,8 +418,10 @@ class StdAndFileLogger(object):
         self.use_stderr = stderr
         self.log_filename = log_filename
         self.silent = silent
-        if not os.path.exists(self.log_filename):
-            open(self.log_filename, 'w'). close()
+        # File is opened once, every message is appended to it without
+        # buffering.
+        self.log_fd = open_for_append(self.log_filename)
+        weakref.finalize(self, os.close, self.log_fd)
 
     def write(self, message):
         if not self.silent:
@@ -412,8 +431,7 @@ class StdAndFileLogger(object):
             else:
                 self.terminal.write(message)
                 self.terminal.flush()
-        with open(self.log_filename, 'a') as fl:
-            fl.write(message)
+        os.write(self.log_fd, message.encode())
 
     def flush(self):
         # this flush method is needed for python 3 compatibility.
@@ -422,6 +440,54 @@ class StdAndFileLogger(object):
         pass
 
 
+class StdToLoggerStream(object):
+    """
+    Stream that sends lines written to it as records of the logger. Output
+    is kept until the end of line so that parts of lines written by different
+    processes do not mix.
+
+    :param logger: Logger to send lines to.
+    :type logger: :class:`logging.Logger`
+    :param level: Level of the records.
+    :type level: int
+    """
+    def __init__(self, logger, level=logging.INFO):
+        self.logger = logger
+        self.level = level
+        self.buffer = ''
+
+    def write(self, message):
+        self.buffer += message
+        if '\n' in self.buffer:
+            lines, self.buffer = self.buffer.rsplit('\n', 1)
+            self.logger.log(self.level, lines)
+
+    def flush(self):
+        # Unfinished line is sent with the next end of line.
+        pass
+
+
+class LoggingQueue(queues.SimpleQueue):
+    """
+    Queue for records of :class:`logging.handlers.QueueHandler` that could be
+    shared between processes. Unlike ``multiprocessing.Queue`` record is
+    written to the pipe by the process itself and not by a background
+    thread. So record is sent once it is logged and process does not hold
+    lock of the queue between records, e.g. when it is terminated.
+
+    :note: Methods used by handler and listener are ``put_nowait`` that
+           blocks until record is written and blocking ``get``.
+    """
+    def __init__(self):
+        super(LoggingQueue, self).__init__(ctx=get_context())
+
+    def put_nowait(self, obj):
+        self.put(obj)
+
+    def get(self, block=True):
+        return super(LoggingQueue, self).get()
+
+
 def get_aic_score(n_params, log_likelihood):
     """
     Returns AIC score.
@@ -4,6 +4,8 @@ import os
 import numpy as np
 import copy
 import shutil
+import gc
+from multiprocessing import Process, Queue
 
 import gadma
 from gadma.cli.arg_parser import ArgParser, get_settings,\
@@ -25,6 +27,13 @@ def get_settings_test():
     return settings, args
 
 
+def add_models_to_shared_dict(shared_dict, process):
+    shared_dict.update_best_model_for_process(process, 'log-likelihood',
+                                              'engine', [1, 2, 3], -20)
+    shared_dict.update_best_model_for_process(process, 'log-likelihood',
+                                              'engine', [2, 3, 4], -10)
+
+
 class TestCLI(unittest.TestCase):
     def test_argparser(self):
         parser = ArgParser()
@@ -442,6 +451,48 @@ class TestCLI(unittest.TestCase):
         d.get_models_in_group('log-likelihood', align_y_dict=True)
         d.get_models_in_group('log-likelihood', align_y_dict=False)
 
+        d = SharedDictForCoreRun(number_of_runs=2)
+        self.assertIsNone(d.get_best_value(1))
+        d.set_best_value(1, -10)
+        d.set_best_value(3, -5)
+        self.assertEqual(d.get_best_value(1), -10)
+        self.assertIsNone(d.get_best_value(2))
+        self.assertIsNone(d.get_best_value(3))
+
+        # results of pickleability checks do not keep models alive
+        model = EpochDemographicModel()
+        self.assertTrue(d._is_pickleable(model))
+        self.assertEqual(len(d._pickleable_models), 1)
+        del model
+        gc.collect()
+        self.assertEqual(len(d._pickleable_models), 0)
+
+    def test_shared_dict_updates(self):
+        d = SharedDictForCoreRun()
+        self.assertIsNone(d.queue)
+        d.update_best_model_for_process(1, 'log-likelihood', 'engine',
+                                        [1, 2, 3], -10)
+        d.receive_updates()
+        self.assertEqual(list(d.dict.keys()), [1])
+
+        d = SharedDictForCoreRun(queue=Queue())
+        processes = [Process(target=add_models_to_shared_dict, args=(d, i))
+                     for i in [1, 2]]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual(d.dict, {})
+        d.receive_updates()
+        self.assertEqual(sorted(d.dict.keys()), [1, 2])
+        for i in [1, 2]:
+            engine, x, y = d.get_best_model_for_process_in_group(
+                i, 'log-likelihood')
+            self.assertEqual(x, [2, 3, 4])
+            self.assertEqual(y, {'log-likelihood': -10})
+        d.receive_updates()
+        self.assertEqual(sorted(d.dict.keys()), [1, 2])
+
     def test_get_variables_function(self):
 
         def check(variables):
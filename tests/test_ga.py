@@ -12,6 +12,7 @@ import pickle
 import os
 import sys
 import timeit
+import queue
 
 EXAMPLE_FOLDER = os.path.join(os.path.dirname(__file__), "test_data")
 EXAMPLE_DATA = os.path.join(EXAMPLE_FOLDER, "YRI_CEU.fs")
@@ -199,6 +200,40 @@ class TestGeneticAlg(unittest.TestCase):
         self.assertRaises(ValueError, ga.selection, f,
                           variables, X_gen, selection_type='bad_type')
 
+    def test_migration(self):
+        n_var = 5
+        variables = []
+        for i in range(n_var):
+            variables.append(ContinuousVariable('var%d' % i, domain=[0,1]))
+        X_gen = [WeightedMetaArray([var.resample() for var in variables])
+                 for _ in range(10)]
+        Y_gen = [float(i + 1) for i in range(10)]
+
+        ga = GeneticAlgorithm(gen_size=10, n_elitism=2, migration_rate=0.2)
+        in_queue, out_queue = queue.Queue(), queue.Queue()
+        ga.migration_queues = (in_queue, out_queue)
+
+        # migrants from another search space are ignored
+        other_key = ga._migration_key(variables[:-1])
+        in_queue.put((other_key, [np.zeros(n_var - 1)], [-1.0]))
+        X_new, Y_new = ga.migration(variables, X_gen, Y_gen)
+        self.assertEqual(Y_new, Y_gen)
+        self.assertTrue(in_queue.empty())
+        key, X_sent, Y_sent = out_queue.get_nowait()
+        self.assertEqual(key, ga._migration_key(variables))
+        self.assertEqual(Y_sent, Y_gen[:2])
+
+        # good migrant replaces one of non-elite solutions
+        x_migr = WeightedMetaArray(np.zeros(n_var))
+        x_migr.metadata = 'm'
+        in_queue.put((key, gadma.utils.list_with_weights_for_pickle([x_migr]),
+                      [0.0]))
+        X_new, Y_new = ga.migration(variables, X_gen, Y_gen)
+        self.assertEqual(len(X_new), len(X_gen))
+        self.assertEqual(Y_new[0], 0.0)
+        self.assertEqual(X_new[0].metadata, 'm')
+        self.assertEqual(Y_new[1:3], Y_gen[:2])
+
     def test_opt_without_report_file(self):
         def f(x):
             return np.sum(x)
@@ -7,6 +7,7 @@ from gadma.engines import *
 from gadma.models import *
 from gadma.cli.arg_parser import test_args
 from gadma.core import SharedDictForCoreRun
+from gadma.utils import WeightedMetaArray
 
 import gadma
 import dadi
@@ -17,12 +18,21 @@ import os
 import sys
 import numpy as np
 import pickle
+import queue
+import multiprocessing
 
 warnings.filterwarnings(action='ignore', category=UserWarning,
                         module='.*\.optimizer', lineno=139)
 
 DATA_PATH = os.path.join(os.path.dirname(__file__), "test_data")
 
+def put_to_migration_queues(migration_queues, worker_counter, index):
+    gadma.core.core.init_worker(None, None, migration_queues,
+                                worker_counter=worker_counter)
+    in_queue, out_queue = gadma.core.core._migration_queues
+    in_queue.put(('in', index))
+    out_queue.put(('out', index))
+
 def calc_func(x, y):
     x = np.array(x)
     return np.sum(x ** 4 + 2 * x ** 3 - 12 * x ** 2 - 2 * x + 6)
@@ -148,6 +158,23 @@ class TestBaseOptClass(unittest.TestCase):
         self.assertRaises(NotImplementedError, opt.optimize, f, [])
         opt.write_report(0, [], [], 10, report_file=None)
 
+    def test_optimizer_result_copies_solutions(self):
+        x = WeightedMetaArray([1.0, 2.0])
+        x.metadata = 'cm'
+        x.weights = np.array([1.0, 2.0])
+        result = OptimizerResult(x=x, y=1, success=True, status=0,
+                                 message='', X=[x, [3.0, 4.0]], Y=[1, 2],
+                                 n_eval=2, n_iter=1, X_out=[x], Y_out=[1])
+        for x_copy in [result.X[0], result.X_out[0]]:
+            self.assertIsInstance(x_copy, WeightedMetaArray)
+            self.assertIsNot(x_copy, x)
+            self.assertEqual(x_copy.metadata, 'cm')
+            self.assertIsNot(x_copy.weights, x.weights)
+            self.assertTrue(np.array_equal(x_copy.weights, x.weights))
+        self.assertEqual(result.X[1], [3.0, 4.0])
+        x.weights[0] = 10
+        self.assertEqual(result.X[0].weights[0], 1.0)
+
 
 class TestLocalOpt(TestBaseOptClass):
     def test_not_implemented_error(self):
@@ -465,6 +492,75 @@ class TestCoreRun(unittest.TestCase):
             multiprocessing=False)
         gadma.core.core.job(0, shared_dict, settings)
 
+    def test_core_run_sending_of_best_models(self):
+        settings = test_args()
+        settings.input_file = os.path.join(DATA_PATH, 'small_1pop.fs')
+        sent = queue.Queue()
+        shared_dict = SharedDictForCoreRun(queue=sent)
+
+        def check_sent_entry():
+            # sent entry does not depend on the current model of the run
+            _, process_dict = sent.get_nowait()
+            engine, x, y = process_dict['log-likelihood']
+            self.assertIsNot(engine, core_run.engine)
+            self.assertIsNot(engine.model, core_run.engine.model)
+            return y['log-likelihood']
+
+        try:
+            core_run = CoreRun(1, shared_dict, settings)
+            x = [var.resample() for var in core_run.model.variables]
+            eps = settings.eps
+            # first model is sent
+            core_run.base_callback(x, -100)
+            self.assertEqual(check_sent_entry(), -100)
+            # small improvements are sent once per SEND_EVERY_N_UPDATES
+            for i in range(1, CoreRun.SEND_EVERY_N_UPDATES):
+                core_run.base_callback(x, -100 + i * eps / 100)
+                self.assertTrue(sent.empty())
+            engine, _, y = shared_dict.get_best_model_for_process_in_group(
+                1, 'log-likelihood')
+            self.assertEqual(y['log-likelihood'], core_run.y_best)
+            core_run.base_callback(x, -99)
+            self.assertEqual(check_sent_entry(), -99)
+            # improvement by eps is sent at once
+            core_run.base_callback(x, -99 + eps)
+            self.assertEqual(check_sent_entry(), -99 + eps)
+            # worse models are not saved
+            core_run.base_callback(x, -200)
+            self.assertTrue(sent.empty())
+            self.assertEqual(core_run.y_best, -99 + eps)
+
+            # model that was not sent is copied before structure increase
+            core_run.base_callback(x, -99 + eps * 1.01)
+            self.assertTrue(sent.empty())
+            shared_dict.copy_models_for_process(1)
+            core_run.model, _ = core_run.model.increase_structure([2])
+            engine, x_saved, _ = \
+                shared_dict.get_best_model_for_process_in_group(
+                    1, 'log-likelihood')
+            self.assertEqual(engine.model.get_structure(), [1])
+            self.assertEqual(len(engine.model.variables), len(x_saved))
+        finally:
+            if check_dir_existence(settings.output_directory):
+                shutil.rmtree(settings.output_directory)
+
+    def test_migration_ring(self):
+        n_workers = 3
+        migration_queues = [multiprocessing.Queue() for _ in range(n_workers)]
+        worker_counter = multiprocessing.Value('i', 0)
+        for i in range(n_workers):
+            process = multiprocessing.Process(
+                target=put_to_migration_queues,
+                args=(migration_queues, worker_counter, i))
+            process.start()
+            process.join()
+        # worker sends to its queue and receives from the previous one
+        for i, migration_queue in enumerate(migration_queues):
+            messages = [migration_queue.get(timeout=10) for _ in range(2)]
+            self.assertEqual(sorted(messages),
+                             [('in', (i + 1) % n_workers), ('out', i)])
+            self.assertTrue(migration_queue.empty())
+
     def test_core_run_restore(self):
         old_run_out = os.path.join(DATA_PATH, "my_example_run")
         sys.argv = ['gadma', "--resume", old_run_out]
@@ -4,9 +4,13 @@ from gadma.utils.utils import CacheInfo, WeightedMetaArray,\
     logarithm_transform, run_f_and_save_result_into_queue, timeout
 from gadma.utils.distributions import *
 from gadma.utils import *
+from gadma.core.core import init_worker, start_output_listener
 import numpy as np
 import multiprocessing
+import logging
 import time
+import sys
+import io
 
 
 def f_sleep_10(x):
@@ -14,6 +18,14 @@ def f_sleep_10(x):
     return x
 
 
+def print_in_pool_process(log_queue):
+    init_worker(None, None, log_queue=log_queue)
+    print("Line 1")
+    print("Line 2 in", end='')
+    print(" two parts")
+    print("Error", file=sys.stderr)
+
+
 class TestUtils(unittest.TestCase):
     def test_distributions(self):
         trunc_normal(1, 0.5, 0, 10)
@@ -80,3 +92,32 @@ class TestUtils(unittest.TestCase):
         del x.metadata
         x.__str__()
         x.__repr__()
+
+    def test_std_to_logger_stream(self):
+        logger = logging.getLogger('gadma.test_std_to_logger_stream')
+        logger.setLevel(logging.INFO)
+        with self.assertLogs(logger, level=logging.INFO) as logs:
+            stream = StdToLoggerStream(logger)
+            stream.write("Line 1\nLine 2 in")
+            stream.flush()
+            self.assertEqual(len(logs.records), 1)
+            stream.write(" two parts\n")
+            stream.write("Line 3\nLine 4\n")
+            StdToLoggerStream(logger, logging.ERROR).write("Error\n")
+        self.assertEqual([record.getMessage() for record in logs.records],
+                         ["Line 1", "Line 2 in two parts",
+                          "Line 3\nLine 4", "Error"])
+        self.assertEqual([record.levelno for record in logs.records],
+                         [logging.INFO] * 3 + [logging.ERROR])
+
+    def test_output_of_pool_processes(self):
+        log_queue = LoggingQueue()
+        stdout, stderr = io.StringIO(), io.StringIO()
+        listener = start_output_listener(log_queue, stdout, stderr)
+        process = multiprocessing.Process(target=print_in_pool_process,
+                                          args=(log_queue,))
+        process.start()
+        process.join()
+        listener.stop()
+        self.assertEqual(stdout.getvalue(), "Line 1\nLine 2 in two parts\n")
+        self.assertEqual(stderr.getvalue(), "Error\n")